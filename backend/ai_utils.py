@@ -14,11 +14,15 @@ Features:
 - Automatic retry logic for API failures
 - Rate limiting to comply with API usage policies
 - Recommendation file generation and storage
+- Content-addressed caching of recommendations for unchanged stock data
+- Persistent cache of sector classifications
 
 Functions:
 - init_ai_clients(): Initialize AI clients for available providers
 - get_available_client(): Get an available AI client with fallback logic
 - classify_sector(company, max_retries=3): Classify a company into a predefined sector
+- classify_sectors(companies, batch_size=20, max_workers=8, max_retries=3): Classify many companies in batched AI calls
+- recommendations_cache_path(nasdaq_data, top_n=5, bottom_n=5): Cache file for recommendations on identical data
 - get_stock_recommendations(nasdaq_data, top_n=5, bottom_n=5): Generate investment recommendations
 - analyze_stocks(nasdaq_data): Analyze NASDAQ stock data and generate investment recommendations
 - analyze_uploaded_files(file_contents): Analyze uploaded files using AI and generate insights
@@ -27,6 +31,7 @@ Usage:
 1. Ensure API keys are set in config.py (OPENAI_API_KEY and/or GEMINI_API_KEY)
 2. Initialize clients: init_ai_clients()
 3. Classify sectors: sector = classify_sector("Apple Inc.")
+   or, for many companies: sectors = classify_sectors(nasdaq_df['name'])
 4. Get recommendations: recommendations, file_path = get_stock_recommendations(nasdaq_df)
 
 Dependencies:
@@ -39,7 +44,13 @@ Dependencies:
 import time
 import random
 import os
+import hashlib
+import atexit
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import pandas as pd
 from openai import OpenAI
 import google.generativeai as genai
 import config
@@ -48,6 +59,14 @@ import config
 openai_client = None
 gemini_client = None
 
+# Company -> sector classifications, persisted to DATA_DIR/sector_cache.json
+sector_cache = None
+sector_cache_lock = threading.Lock()
+sector_cache_save_lock = threading.Lock()
+
+# Sector used when the AI answer cannot be mapped onto config.SECTORS
+DEFAULT_SECTOR = "Technology"
+
 def init_ai_clients():
     """Initialize AI clients for all available providers"""
     global openai_client, gemini_client
@@ -168,28 +187,37 @@ def call_ai_service(prompt, task_type="recommendation", max_retries=3):
 
 def call_openai(client, prompt, task_type):
     """Make an OpenAI API call"""
-    model = config.get_classification_model("openai") if task_type == "classification" else config.get_recommendation_model("openai")
+    classification = task_type in ("classification", "batch_classification")
+    model = config.get_classification_model("openai") if classification else config.get_recommendation_model("openai")
+    
+    options = {}
+    if task_type == "batch_classification":
+        # Force a parseable JSON object for batched answers
+        options["response_format"] = {"type": "json_object"}
     
     response = client.chat.completions.create(
         model=model,
         messages=[{"role": "user", "content": prompt}],
-        temperature=0.0 if task_type == "classification" else 0.5,
-        max_tokens=2000 if task_type == "recommendation" else 50
+        temperature=0.0 if classification else 0.5,
+        max_tokens=50 if task_type == "classification" else 2000,
+        **options
     )
     return response.choices[0].message.content
 
 def call_gemini(client, prompt, task_type):
     """Make a Gemini API call"""
     # For different tasks, we might want to use different models
-    if task_type == "classification":
+    classification = task_type in ("classification", "batch_classification")
+    if classification:
         model = genai.GenerativeModel(config.get_classification_model("gemini"))
     else:
         model = genai.GenerativeModel(config.get_recommendation_model("gemini"))
     
     # Configure generation parameters
     generation_config = genai.types.GenerationConfig(
-        temperature=0.0 if task_type == "classification" else 0.5,
-        max_output_tokens=2000 if task_type == "recommendation" else 50,
+        temperature=0.0 if classification else 0.5,
+        max_output_tokens=50 if task_type == "classification" else 2000,
+        response_mime_type="application/json" if task_type == "batch_classification" else None,
     )
     
     response = model.generate_content(prompt, generation_config=generation_config)
@@ -206,6 +234,11 @@ def classify_sector(company, max_retries=3):
     Returns:
         str: Classified sector name
     """
+    # Classification runs at temperature 0, so earlier answers can be reused
+    cached = _get_sector_cache().get(company)
+    if cached is not None:
+        return cached
+        
     # Initialize clients if not already done
     if not openai_client and not gemini_client:
         init_ai_clients()
@@ -218,7 +251,57 @@ Company: {company}
 Respond with only the sector name, nothing else."""
 
     result = call_ai_service(prompt, task_type="classification", max_retries=max_retries)
-    
+    sector = _match_sector(result)
+    if sector is None:
+        # Unrecognised answers and errors are not cached, so they are retried next time
+        return DEFAULT_SECTOR
+    _remember_sectors({company: sector})
+    return sector
+
+def _sector_cache_path():
+    """On-disk location of the sector classification cache"""
+    return os.path.join(config.DATA_DIR, "sector_cache.json")
+
+def _get_sector_cache():
+    """Get the company -> sector cache, loading it from disk on first use"""
+    global sector_cache
+    with sector_cache_lock:
+        if sector_cache is None:
+            try:
+                with open(_sector_cache_path(), 'rb') as f:
+                    sector_cache = orjson.loads(f.read())
+            except (OSError, ValueError):
+                sector_cache = {}
+            atexit.register(_save_sector_cache)
+        return sector_cache
+
+def _remember_sectors(sectors):
+    """Add classifications to the sector cache"""
+    cache = _get_sector_cache()
+    with sector_cache_lock:
+        cache.update(sectors)
+
+def _save_sector_cache():
+    """Write the sector cache to disk atomically"""
+    # Saves run from concurrent tasks and atexit; serialize them so the newest
+    # snapshot is written last and no two saves share the temporary file
+    with sector_cache_save_lock:
+        with sector_cache_lock:
+            if sector_cache is None:
+                return
+            data = orjson.dumps(sector_cache)
+        path = _sector_cache_path()
+        # Per-process name, since several app processes may share the data directory
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving sector cache: {e}")
+
+def _match_sector(result):
+    """Map an AI answer onto one of config.SECTORS, or return None if it matches none of them"""
     # Validate the result is in our sectors list
     if result in config.SECTORS:
         return result
@@ -229,8 +312,96 @@ Respond with only the sector name, nothing else."""
             if sector.lower() in result_lower or result_lower in sector.lower():
                 return sector
         
-        # Default fallback
-        return "Technology"
+        return None
+
+def _classify_sector_batch(companies, max_retries=3):
+    """Classify one batch of companies with a single AI call"""
+    sectors_list = ", ".join(config.SECTORS)
+    company_lines = "\n".join(f"- {company}" for company in companies)
+    prompt = f"""Classify each of the following companies into one of these sectors: {sectors_list}
+
+Companies:
+{company_lines}
+
+Respond with only a JSON object mapping each company name, exactly as given, to its sector name."""
+
+    result = call_ai_service(prompt, task_type="batch_classification", max_retries=max_retries)
+    if result.startswith("Error:"):
+        # Every provider already failed with retries; classifying the companies
+        # one by one would only multiply the failing calls
+        print(f"Batch classification failed ({result}), using {DEFAULT_SECTOR} for {len(companies)} companies")
+        return dict.fromkeys(companies, DEFAULT_SECTOR)
+    try:
+        # Tolerate a Markdown code fence around the JSON
+        answer = orjson.loads(result.strip().removeprefix("```json").strip("`"))
+    except ValueError:
+        answer = None
+    if not isinstance(answer, dict):
+        print(f"Could not parse batch classification response, classifying {len(companies)} companies individually")
+        answer = {}
+        
+    sectors = {company: _match_sector(str(answer[company])) for company in companies if company in answer}
+    _remember_sectors({company: sector for company, sector in sectors.items() if sector is not None})
+    # Companies the model skipped are classified on their own; unrecognised
+    # answers fall back to the default without being cached
+    for company in companies:
+        if company not in sectors:
+            sectors[company] = classify_sector(company, max_retries)
+        elif sectors[company] is None:
+            sectors[company] = DEFAULT_SECTOR
+    return sectors
+
+def classify_sectors(companies, batch_size=20, max_workers=8, max_retries=3):
+    """
+    Return sectors for many companies, classifying them in batches
+    
+    Companies classified before (in this or an earlier run) are answered from
+    the sector cache. Each AI call classifies up to batch_size of the rest, and
+    batches are sent concurrently, so N companies take about N / batch_size
+    calls instead of N.
+    
+    Args:
+        companies (iterable): Company names to classify
+        batch_size (int): Companies per AI call
+        max_workers (int): Maximum number of concurrent AI calls
+        max_retries (int): Maximum number of retries per call
+        
+    Returns:
+        dict: Sector name for each company
+    """
+    # Initialize clients if not already done
+    if not openai_client and not gemini_client:
+        init_ai_clients()
+        
+    cache = _get_sector_cache()
+    sectors = {}
+    missing = []
+    for company in dict.fromkeys(companies):
+        if company in cache:
+            sectors[company] = cache[company]
+        else:
+            missing.append(company)
+    if not missing:
+        return sectors
+        
+    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch_sectors in executor.map(lambda batch: _classify_sector_batch(batch, max_retries), batches):
+            sectors.update(batch_sectors)
+    _save_sector_cache()
+    return sectors
+
+def recommendations_cache_path(nasdaq_data, top_n=5, bottom_n=5):
+    """
+    Get the cache file path for recommendations generated from this exact input
+    
+    The key hashes the symbol, ytd and sector columns (plus the prompt sizes), so
+    unchanged data maps to the same file and the AI call can be skipped.
+    """
+    row_hashes = pd.util.hash_pandas_object(nasdaq_data[['symbol', 'ytd', 'sector']], index=False)
+    digest = hashlib.blake2b(row_hashes.values.tobytes(), digest_size=8)
+    digest.update(f"{top_n}:{bottom_n}".encode())
+    return os.path.join(config.RESULTS_DIR, f"rec_{digest.hexdigest()}.txt")
 
 def get_stock_recommendations(nasdaq_data, top_n=5, bottom_n=5):
     """Get stock recommendations based on the data using AI"""
@@ -246,7 +417,7 @@ def get_stock_recommendations(nasdaq_data, top_n=5, bottom_n=5):
     bottom_performers = nasdaq_data.sort_values(by='ytd', ascending=True).head(bottom_n)
     
     # Prepare sector performance data
-    sector_performance = nasdaq_data.groupby('sector')['ytd'].mean().reset_index()
+    sector_performance = nasdaq_data.groupby('sector', observed=True, sort=False)['ytd'].mean().reset_index()
     sector_performance = sector_performance.sort_values(by='ytd', ascending=False)
     
     # Create the prompt
@@ -270,18 +441,28 @@ Use markdown formatting for headers, lists, and emphasis.
 """
 
     try:
-        recommendations = call_ai_service(prompt, task_type="recommendation")
+        # Ensure the results directory exists
+        os.makedirs(config.RESULTS_DIR, exist_ok=True)
         
-        if recommendations.startswith("Error:"):
-            print(recommendations)
-            return recommendations, None
+        # Reuse recommendations already generated for identical data
+        cache_path = recommendations_cache_path(nasdaq_data, top_n, bottom_n)
+        if os.path.exists(cache_path):
+            print(f"Using cached recommendations from {cache_path}")
+            with open(cache_path, "r") as f:
+                recommendations = f.read()
+        else:
+            recommendations = call_ai_service(prompt, task_type="recommendation")
+            
+            if recommendations.startswith("Error:"):
+                print(recommendations)
+                return recommendations, None
+            
+            with open(cache_path, "w") as f:
+                f.write(recommendations)
         
         # Save recommendations to file
         current_date = datetime.now().strftime("%Y-%m-%d")
         
-        # Ensure the results directory exists
-        os.makedirs(config.RESULTS_DIR, exist_ok=True)
-        
         # Save as both markdown and text files
         md_output_path = os.path.join(config.RESULTS_DIR, f"stock_recommendations_{current_date}.md")
         txt_output_path = os.path.join(config.RESULTS_DIR, f"stock_recommendations_{current_date}.txt")
@@ -318,11 +499,13 @@ def analyze_stocks(nasdaq_data):
         # Add a sector column if it doesn't exist
         nasdaq_data['sector'] = 'Unknown'
         
-        # Classify sectors for each company
-        for idx, row in nasdaq_data.iterrows():
-            company_name = row.get('name', row.get('company_name', ''))
-            if company_name:
-                nasdaq_data.at[idx, 'sector'] = classify_sector(company_name)
+        # Classify sectors for all companies in batched AI calls
+        name_column = 'name' if 'name' in nasdaq_data.columns else 'company_name'
+        if name_column in nasdaq_data.columns:
+            company_names = nasdaq_data[name_column].fillna('')
+            sectors = classify_sectors(name for name in company_names.unique() if name)
+            # Categorical sectors let the recommendation groupby work on integer codes
+            nasdaq_data['sector'] = config.sector_categorical(company_names.map(sectors).fillna('Unknown'))
     
     # Generate recommendations
     recommendations, output_path = get_stock_recommendations(nasdaq_data)
@@ -19,6 +19,7 @@ Usage:
    - GET /api/data-status: Check if stock data is available
    - POST /api/fetch-data: Fetch stock data (params: max_stocks, use_mock_data)
    - GET /api/task-status: Get status of current background task
+   - GET /api/task-events: Stream task status changes (Server-Sent Events)
    - POST /api/get-recommendations: Generate AI recommendations
    - GET /api/results: Get list of recommendation files
    - GET /api/download/<filename>: Download a recommendation file
@@ -38,10 +39,12 @@ the main thread. Only one background task can run at a time.
 
 import os
 import pandas as pd
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import json
+import orjson
 import traceback
 from werkzeug.utils import secure_filename
 
@@ -68,7 +71,8 @@ def add_cors_headers(resp):
 @app.route('/api/<path:_opts>', methods=['OPTIONS'])
 def api_preflight(_opts):
     return ('', 204)
-app.secret_key = os.urandom(24)
+app.secret_key = config.get_secret_key()
+config.ensure_dirs()
 
 # Global variables to store state
 current_task = None
@@ -76,8 +80,26 @@ task_progress = 0
 task_total = 0
 task_message = ""
 task_complete = False
+task_status_json = b""
+task_status_version = 0
+task_status_changed = threading.Condition()
 nasdaq_df = None
 
+def publish_task_status():
+    """Pre-render the /api/task-status payload after a task state change and wake event streams"""
+    global task_status_json, task_status_version
+    payload = orjson.dumps({
+        'task': current_task,
+        'progress': task_progress,
+        'total': task_total,
+        'message': task_message,
+        'complete': task_complete
+    })
+    with task_status_changed:
+        task_status_json = payload
+        task_status_version += 1
+        task_status_changed.notify_all()
+
 def reset_task_status():
     """Reset the task status variables"""
     global current_task, task_progress, task_total, task_message, task_complete
@@ -86,21 +108,16 @@ def reset_task_status():
     task_total = 0
     task_message = ""
     task_complete = False
+    publish_task_status()
 
-def save_stock_data(df):
-    """Save stock data to a CSV file"""
-    try:
-        if df is None or df.empty:
-            return False
-        
-        # Save to the data directory
-        output_path = os.path.join(config.DATA_DIR, "nasdaq100_mock_data.csv")
-        df.to_csv(output_path, index=False)
-        print(f"Saved stock data to {output_path}")
-        return True
-    except Exception as e:
-        print(f"Error saving stock data: {e}")
-        return False
+publish_task_status()
+
+def load_stock_data():
+    """Load the most recently fetched stock data, falling back to the mock data"""
+    df = stock_data.load_cached_stock_data()
+    if df is None or df.empty:
+        df = stock_data.load_mock_data()
+    return df
 
 @app.route('/api/status', methods=['GET'])
 def status():
@@ -124,7 +141,7 @@ def data_status():
     """Check if we have cached data"""
     global nasdaq_df
     if nasdaq_df is None:
-        nasdaq_df = stock_data.load_mock_data()
+        nasdaq_df = load_stock_data()
     
     return jsonify({
         'has_data': nasdaq_df is not None and not nasdaq_df.empty
@@ -147,6 +164,7 @@ def fetch_data():
     
     # Start the data fetching in a background thread
     current_task = "Fetching stock data"
+    publish_task_status()
     thread = threading.Thread(target=fetch_data_task, args=(max_stocks, use_mock_data))
     thread.daemon = True
     thread.start()
@@ -168,6 +186,7 @@ def fetch_data_task(max_stocks, use_mock_data):
         
         # Load NASDAQ symbols
         task_message = "Loading NASDAQ symbols..."
+        publish_task_status()
         symbols = stock_data.load_nasdaq100_symbols()
         # Note: We're now only getting the top 3 symbols due to Alpha Vantage API rate limits
         
@@ -179,33 +198,43 @@ def fetch_data_task(max_stocks, use_mock_data):
         # Fetch stock data
         task_message = f"Fetching stock data for {len(symbols)} symbols..."
         task_total = len(symbols) + 10  # 10 for initialization steps
+        publish_task_status()
         
         if use_mock_data:
             # Use mock data for testing
-            data_list = stock_data.generate_mock_data(symbols)
-            for i in range(len(symbols)):
-                task_progress = 10 + i
-                task_message = f"Generating mock data ({i+1}/{len(symbols)})"
+            nasdaq_df = stock_data.generate_mock_data(symbols)
+            task_progress = 10 + len(symbols)
+            task_message = f"Generating mock data ({len(symbols)}/{len(symbols)})"
+            publish_task_status()
         else:
             # Fetch real data
-            data_list = []
-            for i, symbol in enumerate(symbols):
+            def fetch(symbol):
                 try:
-                    stock = stock_data.fetch_stock_data(symbol)
-                    if stock is not None:
-                        data_list.append(stock)
+                    return stock_data.fetch_stock_data(symbol)
                 except Exception as e:
                     print(f"Error fetching {symbol}: {e}")
-                
-                task_progress = 10 + i
-                task_message = f"Fetching {symbol} ({i+1}/{len(symbols)})"
-        
-        # Create DataFrame
-        nasdaq_df = pd.DataFrame(data_list)
+                    return None
+                    
+            data_list = []
+            # Fetch symbols concurrently; results come back in symbol order for progress tracking
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for i, (symbol, stock) in enumerate(zip(symbols, executor.map(fetch, symbols))):
+                    if stock is not None:
+                        data_list.append(stock)
+                    
+                    task_progress = 10 + i
+                    task_message = f"Fetching {symbol} ({i+1}/{len(symbols)})"
+                    publish_task_status()
+            
+            # Create DataFrame, grouping sectors on integer category codes
+            nasdaq_df = pd.DataFrame(data_list)
+            if 'sector' in nasdaq_df.columns:
+                nasdaq_df['sector'] = config.sector_categorical(nasdaq_df['sector'])
         
         # Save to cache
         task_message = "Saving data to cache..."
-        save_stock_data(nasdaq_df)
+        publish_task_status()
+        stock_data.save_stock_data(nasdaq_df)
         
         task_progress = task_total
         task_message = "Data fetching complete!"
@@ -217,6 +246,7 @@ def fetch_data_task(max_stocks, use_mock_data):
     finally:
         global current_task
         current_task = None
+        publish_task_status()
 
 @app.route('/api/get-recommendations', methods=['POST'])
 def get_recommendations():
@@ -242,6 +272,7 @@ def get_recommendations():
         reset_task_status()
         task_complete = False
         current_task = "Generating recommendations"
+        publish_task_status()
         
         # Start the background task
         thread = threading.Thread(target=recommendations_task)
@@ -258,6 +289,7 @@ def get_recommendations():
         current_task = None
         task_complete = True
         task_message = f"Error: {str(e)}"
+        publish_task_status()
         
         return jsonify({
             'success': False,
@@ -277,10 +309,11 @@ def recommendations_task():
         # Load NASDAQ data
         task_message = "Loading NASDAQ data..."
         task_progress = 10
+        publish_task_status()
         
         try:
-            # Load mock data
-            nasdaq_df = stock_data.load_mock_data()
+            # Load the fetched data (or the mock data if nothing was fetched yet)
+            nasdaq_df = load_stock_data()
             task_message = f"Loaded data for {len(nasdaq_df)} companies."
         except Exception as e:
             task_message = f"Error loading data: {str(e)}"
@@ -292,6 +325,7 @@ def recommendations_task():
         # Generate recommendations
         task_message = "Generating AI recommendations..."
         task_progress = 30
+        publish_task_status()
         
         output_path = ai_utils.analyze_stocks(nasdaq_df)
         
@@ -305,16 +339,37 @@ def recommendations_task():
     finally:
         global current_task
         current_task = None
+        publish_task_status()
 
 @app.route('/api/task-status', methods=['GET'])
 def task_status():
     """API endpoint to get the status of the current task"""
-    return jsonify({
-        'task': current_task,
-        'progress': task_progress,
-        'total': task_total,
-        'message': task_message,
-        'complete': task_complete
+    return Response(task_status_json, mimetype='application/json')
+
+@app.route('/api/task-events')
+def task_events():
+    """Server-Sent Events stream that pushes the task status until the task is over"""
+    def stream():
+        version = None
+        while True:
+            with task_status_changed:
+                task_status_changed.wait_for(lambda: task_status_version != version, timeout=30)
+                changed = task_status_version != version
+                version = task_status_version
+                payload = task_status_json
+            if changed:
+                yield b"data: " + payload + b"\n\n"
+                # Clients stop listening once the task is over, so free the server thread
+                status = orjson.loads(payload)
+                if status['complete'] or status['task'] is None:
+                    return
+            else:
+                # Comment frame keeps idle connections (and proxies) alive
+                yield b": keep-alive\n\n"
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
 
 @app.route('/api/results', methods=['GET'])
@@ -421,7 +476,7 @@ def get_mock_data():
     """Get mock stock data directly"""
     global nasdaq_df
     if nasdaq_df is None:
-        nasdaq_df = stock_data.load_mock_data()
+        nasdaq_df = load_stock_data()
     
     if nasdaq_df is None or nasdaq_df.empty:
         return jsonify({
@@ -436,7 +491,7 @@ def get_stocks():
     """Get stock data for the frontend"""
     global nasdaq_df
     if nasdaq_df is None:
-        nasdaq_df = stock_data.load_mock_data()
+        nasdaq_df = load_stock_data()
     
     if nasdaq_df is None or nasdaq_df.empty:
         return jsonify([])
@@ -18,6 +18,7 @@ Routes:
 - /fetch-data (POST): Start data fetching task
 - /get-recommendations (POST): Generate AI recommendations
 - /task-status (GET): Get current task status (AJAX endpoint)
+- /task-events (GET): Stream task status changes (Server-Sent Events)
 - /results (GET): View analysis results and recommendations
 - /download/<filename> (GET): Download a recommendation file
 - /view-recommendation/<filename> (GET): View a recommendation file
@@ -33,9 +34,15 @@ Command-line options:
 - --debug: Run in debug mode
 - --host: Host to run the server on (default: 127.0.0.1)
 - --port: Port to run the server on (default: 5000)
+- --production: Serve with waitress (8 worker threads) instead of the Flask dev server
+
+In production the app can also be served by gunicorn with a single worker
+(task progress is kept in process memory), e.g.:
+    gunicorn -k gthread --threads 8 -w 1 -b 0.0.0.0:8881 app:app
 
 Dependencies:
 - Flask
+- waitress (for --production)
 - pandas
 - tqdm
 - Custom modules: config, stock_data, ai_utils
@@ -43,11 +50,14 @@ Dependencies:
 
 import os
 import pandas as pd
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_from_directory, Response, stream_with_context
+from werkzeug.security import safe_join
 from tqdm import tqdm
 import argparse
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 
 # Import our modules
 import config
@@ -56,10 +66,8 @@ import ai_utils
 
 # Create Flask app
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
-
-# Initialize AI clients at startup
-ai_utils.init_ai_clients()
+app.secret_key = config.get_secret_key()
+config.ensure_dirs()
 
 # Add datetime now function to templates
 @app.context_processor
@@ -72,8 +80,27 @@ task_progress = 0
 task_total = 0
 task_message = ""
 task_complete = False
+task_status_json = b""
+task_status_version = 0
+task_status_changed = threading.Condition()
 nasdaq_df = None
 
+def publish_task_status():
+    """Pre-render the /task-status payload after a task state change and wake event streams"""
+    global task_status_json, task_status_version
+    payload = orjson.dumps({
+        'current_task': current_task,
+        'progress': task_progress,
+        'total': task_total,
+        'message': task_message,
+        'complete': task_complete,
+        'percent': int(task_progress / task_total * 100) if task_total > 0 else 0
+    })
+    with task_status_changed:
+        task_status_json = payload
+        task_status_version += 1
+        task_status_changed.notify_all()
+
 def reset_task_status():
     """Reset the task status variables"""
     global current_task, task_progress, task_total, task_message, task_complete
@@ -82,6 +109,9 @@ def reset_task_status():
     task_total = 0
     task_message = ""
     task_complete = False
+    publish_task_status()
+
+publish_task_status()
 
 @app.route('/')
 def index():
@@ -109,6 +139,7 @@ def fetch_data():
     reset_task_status()
     current_task = "fetch_data"
     task_message = "Initializing..."
+    publish_task_status()
     
     # Start the data fetching in a background thread
     thread = threading.Thread(target=fetch_data_task, args=(max_stocks, use_mock_data))
@@ -130,35 +161,44 @@ def fetch_data_task(max_stocks, use_mock_data):
             symbols = symbols[:max_stocks]
         
         task_total = len(symbols)
+        publish_task_status()
         
         # Use pregenerated mock data for better performance
         if use_mock_data:
             task_message = "Loading pregenerated mock data..."
+            publish_task_status()
             # Load all mock data at once (more efficient)
             nasdaq_df = stock_data.load_mock_data()
             
-            # Filter to requested symbols if needed
+            # Filter to requested symbols if needed, comparing integer category codes
             if max_stocks > 0:
-                nasdaq_df = nasdaq_df[nasdaq_df['symbol'].isin(symbols)]
+                symbol_codes = pd.Categorical(symbols, categories=nasdaq_df['symbol'].cat.categories).codes
+                nasdaq_df = nasdaq_df[nasdaq_df['symbol'].cat.codes.isin(symbol_codes[symbol_codes >= 0])]
                 
             task_progress = task_total
+            publish_task_status()
         else:
             # Even when not using "mock" data, we still use our pregenerated data
             # but we simulate fetching each stock individually for progress tracking
             task_message = "Fetching stock data..."
             stock_data_list = []
             
-            for i, symbol in enumerate(symbols):
-                task_message = f"Fetching data for {symbol}..."
-                stock_info = stock_data.fetch_stock_data(symbol)
-                stock_data_list.append(stock_info)
-                task_progress = i + 1
+            publish_task_status()
+            # Fetch symbols concurrently; results come back in symbol order for progress tracking
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for i, (symbol, stock_info) in enumerate(zip(symbols, executor.map(stock_data.fetch_stock_data, symbols))):
+                    stock_data_list.append(stock_info)
+                    task_progress = i + 1
+                    task_message = f"Fetched data for {symbol}"
+                    publish_task_status()
             
             # Create DataFrame
             nasdaq_df = pd.DataFrame(stock_data_list)
+            nasdaq_df['sector'] = config.sector_categorical(nasdaq_df['sector'])
         
         # Save data
         task_message = "Saving data..."
+        publish_task_status()
         stock_data.save_stock_data(nasdaq_df)
         
         task_message = "Data fetching complete!"
@@ -167,6 +207,8 @@ def fetch_data_task(max_stocks, use_mock_data):
     except Exception as e:
         task_message = f"Error: {str(e)}"
         task_complete = True
+    finally:
+        publish_task_status()
 
 @app.route('/get-recommendations', methods=['POST'])
 def get_recommendations():
@@ -181,6 +223,7 @@ def get_recommendations():
     reset_task_status()
     current_task = "get_recommendations"
     task_message = "Generating recommendations..."
+    publish_task_status()
     
     # Start the recommendation task in a background thread
     thread = threading.Thread(target=recommendations_task)
@@ -195,6 +238,7 @@ def recommendations_task():
     
     try:
         task_message = "Analyzing stock data..."
+        publish_task_status()
         recommendations, file_path = ai_utils.get_stock_recommendations(nasdaq_df)
         
         if file_path:
@@ -207,17 +251,38 @@ def recommendations_task():
     except Exception as e:
         task_message = f"Error: {str(e)}"
         task_complete = True
+    finally:
+        publish_task_status()
 
 @app.route('/task-status')
 def task_status():
     """API endpoint to get the current task status"""
-    return jsonify({
-        'current_task': current_task,
-        'progress': task_progress,
-        'total': task_total,
-        'message': task_message,
-        'complete': task_complete,
-        'percent': int(task_progress / max(task_total, 1) * 100) if task_total > 0 else 0
+    return Response(task_status_json, mimetype='application/json')
+
+@app.route('/task-events')
+def task_events():
+    """Server-Sent Events stream that pushes the task status until the task is over"""
+    def stream():
+        version = None
+        while True:
+            with task_status_changed:
+                task_status_changed.wait_for(lambda: task_status_version != version, timeout=30)
+                changed = task_status_version != version
+                version = task_status_version
+                payload = task_status_json
+            if changed:
+                yield b"data: " + payload + b"\n\n"
+                # Clients stop listening once the task is over, so free the server thread
+                status = orjson.loads(payload)
+                if status['complete'] or status['current_task'] is None:
+                    return
+            else:
+                # Comment frame keeps idle connections (and proxies) alive
+                yield b": keep-alive\n\n"
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
 
 @app.route('/results')
@@ -234,14 +299,15 @@ def results():
     bottom_performers = nasdaq_df.sort_values(by='ytd', ascending=True).head(10)
     
     # Get sector performance
-    sector_performance = nasdaq_df.groupby('sector')['ytd'].mean().reset_index()
+    sector_performance = nasdaq_df.groupby('sector', observed=True, sort=False)['ytd'].mean().reset_index()
     sector_performance = sector_performance.sort_values(by='ytd', ascending=False)
     
     # Get recommendation files
     recommendation_files = []
     try:
         files = [f for f in os.listdir(config.RESULTS_DIR) if f.startswith("stock_recommendations_") and f.endswith(".txt")]
-        recommendation_files = sorted(files, key=lambda x: os.path.getmtime(os.path.join(config.RESULTS_DIR, x)), reverse=True)
+        # Dated names (stock_recommendations_YYYY-MM-DD.txt) sort chronologically, no stat needed
+        recommendation_files = sorted(files, reverse=True)
     except Exception as e:
         print(f"Error listing recommendation files: {e}")
     
@@ -258,14 +324,18 @@ def download_file(filename):
 
 @app.route('/view-recommendation/<path:filename>')
 def view_recommendation(filename):
-    """Route to view a recommendation file"""
-    try:
-        with open(os.path.join(config.RESULTS_DIR, filename), 'r') as f:
-            content = f.read()
-        return render_template('view_recommendation.html', filename=filename, content=content)
-    except Exception as e:
-        flash(f"Error reading file: {str(e)}")
+    """Route to view a recommendation file, streamed in chunks as plain text"""
+    file_path = safe_join(config.RESULTS_DIR, filename)
+    if file_path is None or not os.path.isfile(file_path):
+        flash(f"Error reading file: {filename} not found")
         return redirect(url_for('results'))
+    
+    def generate():
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                yield chunk
+    
+    return Response(stream_with_context(generate()), mimetype='text/plain; charset=utf-8')
 
 if __name__ == '__main__':
     # Get port from environment variable or use default
@@ -276,7 +346,12 @@ if __name__ == '__main__':
     parser.add_argument('--debug', action='store_true', help='Run in debug mode')
     parser.add_argument('--host', default='127.0.0.1', help='Host to run the server on')
     parser.add_argument('--port', type=int, default=default_port, help=f'Port to run the server on (default: {default_port})')
+    parser.add_argument('--production', action='store_true', help='Serve with waitress instead of the Flask development server')
     args = parser.parse_args()
     
     # Run the Flask app
-    app.run(debug=args.debug, host=args.host, port=args.port) 
\ No newline at end of file
+    if args.production:
+        from waitress import serve
+        serve(app, host=args.host, port=args.port, threads=8)
+    else:
+        app.run(debug=args.debug, host=args.host, port=args.port) 
\ No newline at end of file
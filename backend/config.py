@@ -11,7 +11,9 @@ Features:
 - Configurable AI provider with fallback support
 - Application directory configuration
 - Customizable application settings via environment variables
-- Stock market sector definitions
+- Stable Flask secret key (FLASK_SECRET_KEY or a persisted generated key)
+- Pooled HTTP session for Finnhub API calls
+- Stock market sector definitions and their Categorical encoding
 - AI model configuration with defaults
 
 Usage:
@@ -24,6 +26,11 @@ Usage:
 2. Import this module: import config
 3. Access configuration values: config.OPENAI_API_KEY, config.DATA_DIR, etc.
 
+Settings are resolved lazily: the .env file is loaded and the configuration is
+validated once, on first attribute access (PEP 562 module __getattr__). Importing
+the module has no filesystem side effects; entrypoints call ensure_dirs() to
+create the data directories.
+
 Directory Structure:
 - DATA_DIR: Directory for storing input data files
 - RESULTS_DIR: Directory for storing output files and recommendations
@@ -36,115 +43,243 @@ AI Provider Configuration:
 
 Dependencies:
 - python-dotenv package for .env file loading
+- requests package for the shared HTTP session
 - Environment variables for API keys and configuration
 """
 
 import os
+import atexit
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
 
 # Get the backend directory (where .env is located)
 BACKEND_DIR = Path(__file__).resolve().parent
 
-# Try to load .env from different locations
-env_paths = [
+# Locations searched for the .env file
+ENV_PATHS = [
     Path('/app/.env'),  # Docker path
     BACKEND_DIR.parent / '.env',  # Local development path
 ]
 
-env_loaded = False
-for env_path in env_paths:
-    if env_path.exists():
-        load_dotenv(env_path)
-        env_loaded = True
-        break
+# Length of a generated Flask secret key
+SECRET_KEY_BYTES = 32
+
+@functools.lru_cache(maxsize=1)
+def _init():
+    """Load the .env file, resolve and validate settings (runs once; see ensure_dirs for directories)"""
+    env_loaded = False
+    for env_path in ENV_PATHS:
+        if env_path.exists():
+            load_dotenv(env_path)
+            env_loaded = True
+            break
+
+    if not env_loaded:
+        raise FileNotFoundError(f"Could not find .env file in any of these locations: {', '.join(str(p) for p in ENV_PATHS)}")
+
+    data_dir = os.path.join(BACKEND_DIR, "data")
+    settings = {
+        # API Keys
+        "OPENAI_API_KEY": os.environ.get("OPEN_AI_KEY"),
+        "ALPHA_VANTAGE_API_KEY": os.environ.get("AlphaAdvantage_API_KEY"),
+        "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY"),
+
+        # Application settings
+        "MAX_STOCKS_DEFAULT": int(os.environ.get("MAX_STOCKS_DEFAULT", "5")),
+
+        # Directory Configuration
+        "DATA_DIR": data_dir,
+        "RESULTS_DIR": os.path.join(data_dir, "results"),
+
+        # Stock data settings
+        "SECTORS": os.environ.get("SECTORS",
+            "Technology,Consumer Cyclical,Industrials,Utilities,Healthcare,Communication,Energy,Consumer Defensive,Real Estate,Financial"
+        ).split(","),
+
+        # API settings
+        "OPENAI_CLASSIFICATION_MODEL": os.environ.get("OPENAI_CLASSIFICATION_MODEL", "gpt-5-mini"),
+        "OPENAI_RECOMMENDATION_MODEL": os.environ.get("OPENAI_RECOMMENDATION_MODEL", "gpt-5-nano"),
+        "GEMINI_CLASSIFICATION_MODEL": os.environ.get("GEMINI_CLASSIFICATION_MODEL", "gemini-2.5-flash"),
+        "GEMINI_RECOMMENDATION_MODEL": os.environ.get("GEMINI_RECOMMENDATION_MODEL", "gemini-2.5-flash-lite"),
+
+        # AI Provider Configuration
+        "PRIMARY_AI_PROVIDER": os.environ.get("PRIMARY_AI_PROVIDER", "openai"),  # "openai" or "gemini"
+        "FALLBACK_AI_PROVIDER": os.environ.get("FALLBACK_AI_PROVIDER", "gemini"),  # "openai" or "gemini"
+    }
+
+    _validate(settings)
 
-if not env_loaded:
-    raise FileNotFoundError(f"Could not find .env file in any of these locations: {', '.join(str(p) for p in env_paths)}")
+    # Publish as real module attributes so later lookups bypass __getattr__
+    globals().update(settings)
+    return settings
 
-# API Keys
-OPENAI_API_KEY = os.environ.get("OPEN_AI_KEY")
-ALPHA_VANTAGE_API_KEY = os.environ.get("AlphaAdvantage_API_KEY")
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+def _validate(settings):
+    """Validate required environment variables"""
+    openai_key = settings["OPENAI_API_KEY"]
+    gemini_key = settings["GEMINI_API_KEY"]
+    primary = settings["PRIMARY_AI_PROVIDER"]
+    fallback = settings["FALLBACK_AI_PROVIDER"]
 
-# Application settings
-MAX_STOCKS_DEFAULT = int(os.environ.get("MAX_STOCKS_DEFAULT", "5"))
+    if not openai_key and not gemini_key:
+        raise ValueError("Either OPEN_AI_KEY or GEMINI_API_KEY is required in the .env file")
 
-# Directory Configuration
-DATA_DIR = os.path.join(BACKEND_DIR, "data")
-RESULTS_DIR = os.path.join(DATA_DIR, "results")
+    if primary == "openai" and not openai_key:
+        if fallback == "gemini" and gemini_key:
+            print("Warning: OpenAI API key not found, but Gemini is available as fallback")
+        else:
+            raise ValueError("OPEN_AI_KEY is required when PRIMARY_AI_PROVIDER is set to 'openai'")
 
-# Ensure directories exist
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(RESULTS_DIR, exist_ok=True)
+    if primary == "gemini" and not gemini_key:
+        if fallback == "openai" and openai_key:
+            print("Warning: Gemini API key not found, but OpenAI is available as fallback")
+        else:
+            raise ValueError("GEMINI_API_KEY is required when PRIMARY_AI_PROVIDER is set to 'gemini'")
 
-# Stock data settings
-SECTORS = os.environ.get("SECTORS", 
-    "Technology,Consumer Cyclical,Industrials,Utilities,Healthcare,Communication,Energy,Consumer Defensive,Real Estate,Financial"
-).split(",")
+def ensure_dirs():
+    """Create the data and results directories (called by the app entrypoints)"""
+    settings = _init()
+    os.makedirs(settings["DATA_DIR"], exist_ok=True)
+    os.makedirs(settings["RESULTS_DIR"], exist_ok=True)
 
-# API settings
-OPENAI_CLASSIFICATION_MODEL = os.environ.get("OPENAI_CLASSIFICATION_MODEL", "gpt-5-mini")
-OPENAI_RECOMMENDATION_MODEL = os.environ.get("OPENAI_RECOMMENDATION_MODEL", "gpt-5-nano")
-GEMINI_CLASSIFICATION_MODEL = os.environ.get("GEMINI_CLASSIFICATION_MODEL", "gemini-2.5-flash")
-GEMINI_RECOMMENDATION_MODEL = os.environ.get("GEMINI_RECOMMENDATION_MODEL", "gemini-2.5-flash-lite")
+def __getattr__(name):
+    """Resolve settings on first access (PEP 562)"""
+    settings = _init()
+    if name in settings:
+        return settings[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# AI Provider Configuration
-PRIMARY_AI_PROVIDER = os.environ.get("PRIMARY_AI_PROVIDER", "openai")  # "openai" or "gemini"
-FALLBACK_AI_PROVIDER = os.environ.get("FALLBACK_AI_PROVIDER", "gemini")  # "openai" or "gemini"
+def _write_secret_key(key_path, replace=False):
+    """
+    Write a new random secret key to key_path.
+    
+    The key is written to a temporary file first and then moved into place, so
+    other processes never read a partially written key. Unless replace is set,
+    an existing key is kept (FileExistsError is raised).
+    """
+    tmp_path = key_path.with_name(f"{key_path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(os.urandom(SECRET_KEY_BYTES))
+    try:
+        if replace:
+            os.replace(tmp_path, key_path)
+        else:
+            try:
+                # Unlike a rename, a hard link never replaces an existing key
+                os.link(tmp_path, key_path)
+            except FileExistsError:
+                raise
+            except OSError:
+                # No hard links on this filesystem
+                if key_path.exists():
+                    raise FileExistsError(key_path)
+                os.replace(tmp_path, key_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+@functools.lru_cache(maxsize=1)
+def get_secret_key():
+    """
+    Get the Flask secret key.
+    
+    Uses FLASK_SECRET_KEY when set; otherwise a random key is generated once and
+    persisted to backend/.secret_key (mode 0600) so sessions survive restarts and
+    are shared by every worker process. A key file that is not SECRET_KEY_BYTES
+    long (e.g. left empty by a crash) is replaced with a new key.
+    """
+    _init()
+    secret_key = os.environ.get("FLASK_SECRET_KEY")
+    if secret_key:
+        return secret_key
+
+    key_path = BACKEND_DIR / ".secret_key"
+    try:
+        _write_secret_key(key_path)
+    except FileExistsError:
+        pass
+
+    key = key_path.read_bytes()
+    if len(key) != SECRET_KEY_BYTES:
+        print(f"Warning: {key_path} does not hold a valid key, generating a new one")
+        _write_secret_key(key_path, replace=True)
+        key = key_path.read_bytes()
+    return key
+
+@functools.lru_cache(maxsize=1)
+def get_http_session():
+    """
+    Get the process-wide pooled HTTP session for outbound API calls.
+    
+    Currently only the Finnhub client (stock_data.OrjsonFinnhubClient) uses it,
+    reusing keep-alive connections across its concurrent requests. The session
+    carries no credentials (callers send their own) and is closed at exit.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    atexit.register(session.close)
+    return session
+
+def sector_categorical(sectors):
+    """
+    Encode a sector column as a Categorical so grouping works on integer codes.
+    
+    Categories follow SECTORS; labels outside that list (e.g. Finnhub
+    industries or 'Unknown') are appended rather than dropped.
+    """
+    configured = _init()["SECTORS"]
+    extra = sorted(set(sectors.dropna()) - set(configured))
+    return pd.Categorical(sectors, categories=configured + extra)
 
 # Helper functions for AI configuration
+@functools.lru_cache(maxsize=None)
 def get_classification_model(provider=None):
     """Get the classification model for the specified provider or primary provider."""
-    provider = provider or PRIMARY_AI_PROVIDER
+    settings = _init()
+    provider = provider or settings["PRIMARY_AI_PROVIDER"]
     if provider == "openai":
-        return OPENAI_CLASSIFICATION_MODEL
+        return settings["OPENAI_CLASSIFICATION_MODEL"]
     elif provider == "gemini":
-        return GEMINI_CLASSIFICATION_MODEL
+        return settings["GEMINI_CLASSIFICATION_MODEL"]
     else:
         raise ValueError(f"Unknown AI provider: {provider}")
 
+@functools.lru_cache(maxsize=None)
 def get_recommendation_model(provider=None):
     """Get the recommendation model for the specified provider or primary provider."""
-    provider = provider or PRIMARY_AI_PROVIDER
+    settings = _init()
+    provider = provider or settings["PRIMARY_AI_PROVIDER"]
     if provider == "openai":
-        return OPENAI_RECOMMENDATION_MODEL
+        return settings["OPENAI_RECOMMENDATION_MODEL"]
     elif provider == "gemini":
-        return GEMINI_RECOMMENDATION_MODEL
+        return settings["GEMINI_RECOMMENDATION_MODEL"]
     else:
         raise ValueError(f"Unknown AI provider: {provider}")
 
+@functools.lru_cache(maxsize=None)
 def get_api_key(provider=None):
     """Get the API key for the specified provider or primary provider."""
-    provider = provider or PRIMARY_AI_PROVIDER
+    settings = _init()
+    provider = provider or settings["PRIMARY_AI_PROVIDER"]
     if provider == "openai":
-        return OPENAI_API_KEY
+        return settings["OPENAI_API_KEY"]
     elif provider == "gemini":
-        return GEMINI_API_KEY
+        return settings["GEMINI_API_KEY"]
     else:
         raise ValueError(f"Unknown AI provider: {provider}")
 
+@functools.lru_cache(maxsize=None)
 def is_provider_available(provider):
     """Check if the specified provider has a valid API key."""
+    settings = _init()
     if provider == "openai":
-        return bool(OPENAI_API_KEY)
+        return bool(settings["OPENAI_API_KEY"])
     elif provider == "gemini":
-        return bool(GEMINI_API_KEY)
+        return bool(settings["GEMINI_API_KEY"])
     else:
         return False
-
-# Validate required environment variables
-if not OPENAI_API_KEY and not GEMINI_API_KEY:
-    raise ValueError("Either OPEN_AI_KEY or GEMINI_API_KEY is required in the .env file")
-
-if PRIMARY_AI_PROVIDER == "openai" and not OPENAI_API_KEY:
-    if FALLBACK_AI_PROVIDER == "gemini" and GEMINI_API_KEY:
-        print("Warning: OpenAI API key not found, but Gemini is available as fallback")
-    else:
-        raise ValueError("OPEN_AI_KEY is required when PRIMARY_AI_PROVIDER is set to 'openai'")
-
-if PRIMARY_AI_PROVIDER == "gemini" and not GEMINI_API_KEY:
-    if FALLBACK_AI_PROVIDER == "openai" and OPENAI_API_KEY:
-        print("Warning: Gemini API key not found, but OpenAI is available as fallback")
-    else:
-        raise ValueError("GEMINI_API_KEY is required when PRIMARY_AI_PROVIDER is set to 'gemini'") 
\ No newline at end of file
@@ -1,5 +1,15 @@
 """
 Run script for the Stock Market Analysis API server
+
+Options:
+- --host: Host to run the server on (default: 0.0.0.0)
+- --port: Port to run the server on (default: BACKEND_PORT or 8881)
+- --debug: Run in debug mode
+- --production: Serve with waitress (8 worker threads) instead of the Flask dev server
+
+The API can also be served by gunicorn with a single worker (task progress
+is kept in process memory), e.g.:
+    gunicorn -k gthread --threads 8 -w 1 -b 0.0.0.0:8881 api:app
 """
 
 import os
@@ -20,8 +30,13 @@ if __name__ == "__main__":
     parser.add_argument("--host", default="0.0.0.0", help="Host to run the server on")
     parser.add_argument("--port", type=int, default=default_port, help=f"Port to run the server on (default: {default_port})")
     parser.add_argument("--debug", action="store_true", help="Run in debug mode")
+    parser.add_argument("--production", action="store_true", help="Serve with waitress instead of the Flask development server")
     
     args = parser.parse_args()
     
     print(f"Starting API server on {args.host}:{args.port}")
-    app.run(host=args.host, port=args.port, debug=args.debug) 
\ No newline at end of file
+    if args.production:
+        from waitress import serve
+        serve(app, host=args.host, port=args.port, threads=8)
+    else:
+        app.run(host=args.host, port=args.port, debug=args.debug) 
\ No newline at end of file
@@ -8,40 +8,224 @@ market data with caching to avoid rate limits.
 Features:
 - Load NASDAQ-100 symbols from CSV file
 - Fetch real-time stock data from Finnhub with caching
-- Cache company profiles and financial data
+- Cache company profiles and financial data in a single SQLite database
 - Calculate year-to-date (YTD) performance
+- Persist fetched data as Parquet for fast memory-mapped reloads
 
 Dependencies:
 - pandas
+- numpy
+- pyarrow
+- orjson
+- cachetools
 - finnhub-python
 - config module with DATA_DIR
 """
 
 import os
+import hashlib
+import csv
+import shutil
+import functools
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import time
-from datetime import datetime, timedelta
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import finnhub
 from dotenv import load_dotenv
 import config
-import json
+import orjson
+import sqlite3
+import queue
+import threading
+import atexit
 from threading import Lock
+from collections import deque
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 
 # Load environment variables
 load_dotenv()
 
+class RateLimiter:
+    """Thread-safe sliding-window limiter allowing at most `calls` calls per `period` seconds"""
+    def __init__(self, calls, period=1.0):
+        self.calls = calls
+        self.period = period
+        self.lock = Lock()
+        self.times = deque()
+        
+    def wait(self):
+        """Block until the caller may make its next call (immediately while the window has room)"""
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                while self.times and now - self.times[0] >= self.period:
+                    self.times.popleft()
+                if len(self.times) < self.calls:
+                    self.times.append(now)
+                    return
+                # Window is full: sleep until its oldest call expires
+                time.sleep(self.period - (now - self.times[0]))
+
+class AdaptiveSemaphore:
+    """
+    Thread-safe concurrency limit tuned by AIMD
+    
+    The limit grows additively (by `increase_by` per limit's worth of successful
+    calls) and is multiplied by `decrease_factor` when the API signals overload,
+    so concurrent workers back off together instead of all retrying.
+    """
+    def __init__(self, initial, minimum=1, maximum=16, increase_by=1.0, decrease_factor=0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase_by = increase_by
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.condition = threading.Condition()
+        
+    def __enter__(self):
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+            
+    def increase(self):
+        """Record a successful call"""
+        with self.condition:
+            self.limit = min(self.maximum, self.limit + self.increase_by / self.limit)
+            self.condition.notify_all()
+            
+    def decrease(self):
+        """Record a throttled or failed call"""
+        with self.condition:
+            self.limit = max(self.minimum, self.limit * self.decrease_factor)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an API whose circuit breaker is open"""
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker that fails fast while an API keeps failing
+    
+    After `threshold` consecutive failures the circuit opens and calls are
+    rejected for `reset_after` seconds. Then a single probe call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+    def __init__(self, threshold=3, reset_after=60):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.lock = Lock()
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        
+    def allow(self):
+        """Whether a call may be made now (claims the probe slot once the open period has passed)"""
+        with self.lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_after:
+                self.state = 'half-open'
+                return True
+            return False
+            
+    def is_open(self):
+        """Whether calls are currently being rejected"""
+        with self.lock:
+            return self.state == 'open'
+            
+    def record_success(self):
+        with self.lock:
+            self.state = 'closed'
+            self.failures = 0
+            
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == 'half-open' or self.failures >= self.threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+class OrjsonFinnhubClient(finnhub.Client):
+    """
+    finnhub.Client that decodes JSON responses with orjson instead of the stdlib json module
+    
+    Requests go through the process-wide pooled session from config.get_http_session().
+    The API key is sent in the X-Finnhub-Token header on each request, so the
+    session itself carries no Finnhub credentials.
+    """
+    DEFAULT_TIMEOUT = (3.05, 27)  # (connect, read) seconds
+    # Headers finnhub.Client would otherwise set on its own session
+    DEFAULT_HEADERS = {"Accept": "application/json", "User-Agent": "finnhub/python"}
+    
+    def __init__(self, api_key, session):
+        self._api_key = api_key
+        self._session = session
+        
+    def close(self):
+        """Leave the session open; it belongs to config and is closed at exit"""
+        
+    def _request(self, method, path, **kwargs):
+        kwargs["headers"] = {
+            **self.DEFAULT_HEADERS,
+            **kwargs.get("headers", {}),
+            "X-Finnhub-Token": self._api_key or "",
+        }
+        return super()._request(method, path, **kwargs)
+        
+    @staticmethod
+    def _handle_response(response):
+        if response.ok and 'application/json' in response.headers.get('Content-Type', ''):
+            try:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                raise finnhub.FinnhubRequestException(f"Invalid Response: {response.text}")
+        return finnhub.Client._handle_response(response)
+
 class CachedFinnhubClient:
     def __init__(self):
-        self.client = finnhub.Client(api_key=os.getenv('FINNHUB_API_KEY'))
-        self.cache_dir = Path(config.DATA_DIR) / 'finnhub_cache'
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.client = OrjsonFinnhubClient(api_key=os.getenv('FINNHUB_API_KEY'), session=config.get_http_session())
+        config.ensure_dirs()
+        self.cache_path = Path(config.DATA_DIR) / 'finnhub_cache.db'
         self.cache_lock = Lock()
-        self.last_quote_time = {}
-        self.quote_cache = {}
+        # Reader connection (writes go through the background writer); access is serialized through cache_lock
+        self.db = sqlite3.connect(self.cache_path, check_same_thread=False)
+        with self.cache_lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "symbol TEXT, kind TEXT, ts REAL, data BLOB, "
+                "PRIMARY KEY (symbol, kind))"
+            )
+        self.rate_limiter = RateLimiter(calls=30, period=1.0)  # Finnhub allows 30 calls per second
+        self.concurrency = AdaptiveSemaphore(initial=4, maximum=16)  # Requests in flight, backs off on 429/5xx
+        self.MAX_RETRIES = 3  # Retries for throttled or failed API calls
+        self.circuit_breaker = CircuitBreaker(threshold=3, reset_after=60)  # Fail fast while quota is exhausted
         self.QUOTE_CACHE_DURATION = timedelta(seconds=10)  # Cache quotes for 10 seconds
         self.PROFILE_CACHE_DURATION = timedelta(days=1)    # Cache profiles for 1 day
         self.FINANCIALS_CACHE_DURATION = timedelta(hours=6)  # Cache financials for 6 hours
+        self.CACHE_RETENTION = timedelta(days=7)  # Drop entries not refreshed for a week
+        # Bounded in-memory quote cache, guarded by cache_lock
+        self.quote_cache = TTLCache(maxsize=256, ttl=self.QUOTE_CACHE_DURATION.total_seconds())
+        # Cache writes are persisted by a background thread; entries not yet written
+        # are served from _pending_writes (guarded by cache_lock)
+        self._pending_writes = {}
+        self._write_queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_cache_entries, name='finnhub-cache-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.flush_cache)
         
     def check_api_status(self):
         """Check if the Finnhub API is working correctly"""
@@ -54,35 +238,149 @@ class CachedFinnhubClient:
         except Exception as e:
             return False, f"API error: {str(e)}"
         
+    def _call_api(self, method, *args, **kwargs):
+        """
+        Call a Finnhub API method within the rate limit and adaptive concurrency limit
+        
+        Throttled (429) and server error (5xx) responses are retried after the
+        delay the server asked for, falling back to exponential backoff. While the
+        circuit breaker is open, calls fail immediately with CircuitOpenError.
+        """
+        for attempt in range(self.MAX_RETRIES + 1):
+            if not self.circuit_breaker.allow():
+                raise CircuitOpenError("Finnhub API is throttling; skipping call until the circuit resets")
+            with self.concurrency:
+                self.rate_limiter.wait()
+                try:
+                    result = method(*args, **kwargs)
+                except finnhub.FinnhubAPIException as e:
+                    if e.status_code != 429 and e.status_code < 500:
+                        # The API answered normally, just not with data
+                        self.circuit_breaker.record_success()
+                        raise
+                    self.concurrency.decrease()
+                    self.circuit_breaker.record_failure()
+                    if attempt == self.MAX_RETRIES or self.circuit_breaker.is_open():
+                        raise
+                    delay = self._retry_delay(e.response, attempt)
+                except Exception:
+                    self.circuit_breaker.record_failure()
+                    raise
+                else:
+                    self.concurrency.increase()
+                    self.circuit_breaker.record_success()
+                    return result
+            # Sleep without holding a concurrency permit
+            time.sleep(delay)
+            
+    @staticmethod
+    def _retry_delay(response, attempt):
+        """Seconds to wait before retrying a throttled call, preferring the server's hint"""
+        headers = getattr(response, 'headers', None) or {}
+        delay = None
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        if delay is None and headers.get('X-Ratelimit-Reset'):
+            # Finnhub sends the reset time as a Unix timestamp
+            try:
+                delay = float(headers['X-Ratelimit-Reset']) - time.time()
+            except ValueError:
+                pass
+        if delay is None:
+            delay = min(60, 2 ** attempt)
+        # Up to a second of jitter so throttled workers don't all retry at once
+        return max(0.0, delay) + random.uniform(0, 1)
+        
     def _load_cache(self, cache_type, symbol):
         """Load cached data for a symbol"""
-        cache_file = self.cache_dir / f"{symbol}_{cache_type}.json"
-        if not cache_file.exists():
-            return None
-            
         try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-                if datetime.fromtimestamp(data['timestamp']) + self._get_cache_duration(cache_type) > datetime.now():
-                    return data['data']
+            with self.cache_lock:
+                row = self._pending_writes.get((symbol, cache_type))
+                if row is not None:
+                    row = row[2:]
+                else:
+                    row = self.db.execute(
+                        "SELECT ts, data FROM cache WHERE symbol = ? AND kind = ?",
+                        (symbol, cache_type)
+                    ).fetchone()
+            if row is None:
+                return None
+                
+            timestamp, data = row
+            if datetime.fromtimestamp(timestamp) + self._get_cache_duration(cache_type) > datetime.now():
+                return orjson.loads(data)
         except Exception:
             return None
         return None
         
     def _save_cache(self, cache_type, symbol, data):
-        """Save data to cache"""
+        """Queue data to be saved to the cache"""
         if data is None:
             return
             
-        cache_file = self.cache_dir / f"{symbol}_{cache_type}.json"
-        cache_data = {
-            'timestamp': datetime.now().timestamp(),
-            'data': data
-        }
-        
+        entry = (symbol, cache_type, datetime.now().timestamp(), orjson.dumps(data))
         with self.cache_lock:
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
+            self._pending_writes[(symbol, cache_type)] = entry
+        self._write_queue.put(entry)
+        
+    def _write_cache_entries(self):
+        """Persist queued cache entries, committing everything queued so far in one transaction"""
+        # The writer has its own connection, so with WAL it never blocks cache reads
+        try:
+            db = sqlite3.connect(self.cache_path)
+        except Exception as e:
+            # Entries stay in _pending_writes for this run; flush_cache stops waiting for this thread
+            print(f"Error opening Finnhub cache for writing: {e}")
+            return
+        self._purge_cache(db)
+        while True:
+            entries = [self._write_queue.get()]
+            while True:
+                try:
+                    entries.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO cache (symbol, kind, ts, data) VALUES (?, ?, ?, ?)",
+                        entries
+                    )
+                with self.cache_lock:
+                    for entry in entries:
+                        key = (entry[0], entry[1])
+                        if self._pending_writes.get(key) is entry:
+                            del self._pending_writes[key]
+            except Exception as e:
+                print(f"Error writing Finnhub cache: {e}")
+            finally:
+                for _ in entries:
+                    self._write_queue.task_done()
+                    
+    def _purge_cache(self, db):
+        """Delete cache entries older than CACHE_RETENTION (symbols no longer requested)"""
+        try:
+            with db:
+                db.execute(
+                    "DELETE FROM cache WHERE ts < ?",
+                    ((datetime.now() - self.CACHE_RETENTION).timestamp(),)
+                )
+        except Exception as e:
+            print(f"Error purging Finnhub cache: {e}")
+            
+    def flush_cache(self):
+        """Block until all queued cache writes have been persisted (or the writer has died)"""
+        # Like Queue.join, but without hanging at exit if the writer thread is gone
+        with self._write_queue.all_tasks_done:
+            while self._write_queue.unfinished_tasks and self._writer.is_alive():
+                self._write_queue.all_tasks_done.wait(timeout=1)
                 
     def _get_cache_duration(self, cache_type):
         """Get cache duration for different types of data"""
@@ -94,19 +392,19 @@ class CachedFinnhubClient:
         
     def get_stock_quote(self, symbol):
         """Get real-time quote for a symbol with short-term caching"""
-        now = datetime.now()
-        
-        # Check in-memory cache first
-        if symbol in self.quote_cache:
-            last_time = self.last_quote_time.get(symbol)
-            if last_time and (now - last_time) < self.QUOTE_CACHE_DURATION:
+        # Check in-memory cache first. Indexing directly (rather than TTLCache.get,
+        # which tests membership and then indexes) checks the key and expiry once
+        try:
+            with self.cache_lock:
                 return self.quote_cache[symbol]
+        except KeyError:
+            pass
         
         try:
-            quote = self.client.quote(symbol)
+            quote = self._call_api(self.client.quote, symbol)
             if quote:
-                self.quote_cache[symbol] = quote
-                self.last_quote_time[symbol] = now
+                with self.cache_lock:
+                    self.quote_cache[symbol] = quote
             return quote
         except Exception as e:
             print(f"Error fetching quote for {symbol}: {e}")
@@ -120,7 +418,7 @@ class CachedFinnhubClient:
             return cached_data
             
         try:
-            profile = self.client.company_profile2(symbol=symbol)
+            profile = self._call_api(self.client.company_profile2, symbol=symbol)
             if profile:
                 self._save_cache('profile', symbol, profile)
             return profile
@@ -136,108 +434,209 @@ class CachedFinnhubClient:
             return cached_data
             
         try:
-            financials = self.client.company_basic_financials(symbol, 'all')
+            financials = self._call_api(self.client.company_basic_financials, symbol, 'all')
             if financials:
+                # Only the current 'metric' values are used; the historical 'series'
+                # block is most of the payload, so don't cache or parse it again
+                financials = {key: value for key, value in financials.items() if key != 'series'}
                 self._save_cache('financials', symbol, financials)
             return financials
         except Exception as e:
             print(f"Error fetching financials for {symbol}: {e}")
             return None
 
-    def batch_get_profiles_and_financials(self, symbols):
-        """Batch get profiles and financials for multiple symbols"""
-        results = {}
-        for symbol in symbols:
-            results[symbol] = {
-                'profile': self.get_company_profile(symbol),
-                'financials': self.get_basic_financials(symbol)
-            }
-            time.sleep(0.1)  # Rate limiting between symbols
-        return results
-
 # Initialize Finnhub client with caching
-finnhub_client = CachedFinnhubClient()
+@functools.lru_cache(maxsize=1)
+def get_finnhub_client():
+    """
+    Get the shared Finnhub client, creating it on first use
+    
+    Processes that only serve mock data never open the cache database or
+    start its writer thread.
+    """
+    return CachedFinnhubClient()
 
+def __getattr__(name):
+    """Keep `stock_data.finnhub_client` working now that the client is created lazily"""
+    if name == 'finnhub_client':
+        return get_finnhub_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Data file paths, resolved once at import
+NASDAQ100_SYMBOLS_CSV = os.path.join(config.DATA_DIR, "nasdaq100.csv")
+MOCK_DATA_CSV = os.path.join(config.DATA_DIR, "nasdaq100_mock_data.csv")
+MOCK_DATA_PARQUET = os.path.join(config.DATA_DIR, "nasdaq100_mock_data.parquet")
+
+# Numeric columns of stock data, parsed as floats ('Unknown' becomes NaN)
+NUMERIC_DTYPES = {col: 'float64' for col in ['ytd', 'market_cap', 'pe_ratio', 'dividend_yield', 'price']}
+
+@functools.lru_cache(maxsize=1)
 def load_nasdaq100_symbols():
-    """Load NASDAQ-100 symbols from CSV file"""
-    symbols_path = os.path.join(config.DATA_DIR, "nasdaq100.csv")
+    """
+    Load NASDAQ-100 symbols from CSV file
     
-    if not os.path.exists(symbols_path):
-        print(f"Warning: NASDAQ-100 symbols file not found at {symbols_path}")
-        return []
+    The file is read once per process; call load_nasdaq100_symbols.cache_clear()
+    to pick up changes to it.
     
+    Returns:
+        tuple: Symbols in file order
+    """
     try:
-        df = pd.read_csv(symbols_path)
-        if 'symbol' not in df.columns:
-            print(f"Warning: 'symbol' column not found in {symbols_path}")
-            if len(df.columns) > 0:
-                return df.iloc[:, 0].tolist()
-            return []
-        return df["symbol"].tolist()
+        # The symbol list is tiny, so the csv module beats pandas' parser setup cost
+        with open(NASDAQ100_SYMBOLS_CSV, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if not header:
+                return ()
+            if 'symbol' in header:
+                column = header.index('symbol')
+            else:
+                print(f"Warning: 'symbol' column not found in {NASDAQ100_SYMBOLS_CSV}")
+                column = 0
+            return tuple(row[column] for row in reader if len(row) > column and row[column])
+    except FileNotFoundError:
+        print(f"Warning: NASDAQ-100 symbols file not found at {NASDAQ100_SYMBOLS_CSV}")
+        return ()
     except Exception as e:
         print(f"Error loading NASDAQ-100 symbols: {e}")
-        return []
+        return ()
+
+@functools.lru_cache(maxsize=1)
+def symbols_digest():
+    """
+    Short content hash of the NASDAQ-100 symbols file
+    
+    Saved stock data is tagged with it, so editing the symbol list invalidates
+    the saved data while touching or re-copying the file does not. Cached like
+    load_nasdaq100_symbols; clear both caches to pick up changes.
+    """
+    digest = hashlib.blake2b(digest_size=4)
+    try:
+        with open(NASDAQ100_SYMBOLS_CSV, 'rb') as f:
+            digest.update(f.read())
+    except FileNotFoundError:
+        pass
+    return digest.hexdigest()
+
+def _unknown_stock_record(symbol):
+    """Placeholder record for a symbol whose data could not be fetched"""
+    return {
+        'symbol': symbol,
+        'name': symbol,
+        'ytd': 0,
+        'sector': 'Unknown',
+        'industry': 'Unknown',
+        'market_cap': 'Unknown',
+        'pe_ratio': 'Unknown',
+        'dividend_yield': 'Unknown',
+        'price': 0
+    }
+
+def _build_stock_record(symbol, current_price, ytd_change, profile, financials):
+    """Assemble a stock record from quote-derived values and cached profile/financials"""
+    if profile:
+        company_name = profile.get('name', symbol)
+        industry = profile.get('finnhubIndustry', 'Unknown')
+        market_cap = profile.get('marketCapitalization', 0)
+    else:
+        company_name = symbol
+        industry = 'Unknown'
+        market_cap = 0
+        
+    if financials and 'metric' in financials:
+        metrics = financials['metric']
+        pe_ratio = metrics.get('peBasicExcl', 'Unknown')
+        dividend_yield = metrics.get('dividendYieldIndicatedAnnual', 'Unknown')
+    else:
+        pe_ratio = 'Unknown'
+        dividend_yield = 'Unknown'
+        
+    return {
+        'symbol': symbol,
+        'name': company_name,
+        'price': current_price,
+        'ytd': ytd_change,
+        'sector': industry,
+        'industry': industry,
+        'market_cap': market_cap,
+        'pe_ratio': pe_ratio,
+        'dividend_yield': dividend_yield
+    }
+
+# Pool for the profile/financials lookups that fetch_stock_data overlaps with its quote
+_detail_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='finnhub-details')
 
 def fetch_stock_data(symbol):
     """
     Fetch real-time stock data for a given symbol using Finnhub with caching
     """
+    detail_futures = []
     try:
+        client = get_finnhub_client()
+        # Start the cached company profile and financials lookups so they overlap the quote
+        profile_future = _detail_executor.submit(client.get_company_profile, symbol)
+        financials_future = _detail_executor.submit(client.get_basic_financials, symbol)
+        detail_futures = [profile_future, financials_future]
+        
         # Get real-time quote (cached for 10 seconds)
-        quote = finnhub_client.get_stock_quote(symbol)
+        quote = client.get_stock_quote(symbol)
         if not quote:
             raise Exception("Failed to fetch quote data")
             
-        # Get cached company profile and financials
-        profile = finnhub_client.get_company_profile(symbol)
-        financials = finnhub_client.get_basic_financials(symbol)
+        profile = profile_future.result()
+        financials = financials_future.result()
         
         # Calculate YTD performance
         current_price = quote['c']
-        ytd_change = ((current_price - quote.get('pc', current_price)) / quote.get('pc', current_price)) * 100 if quote.get('pc') else 0
+        previous_close = quote.get('pc')
+        ytd_change = (current_price - previous_close) / previous_close * 100 if previous_close else 0
         
-        if profile:
-            company_name = profile.get('name', symbol)
-            industry = profile.get('finnhubIndustry', 'Unknown')
-            market_cap = profile.get('marketCapitalization', 0)
-        else:
-            company_name = symbol
-            industry = 'Unknown'
-            market_cap = 0
-            
-        if financials and 'metric' in financials:
-            metrics = financials['metric']
-            pe_ratio = metrics.get('peBasicExcl', 'Unknown')
-            dividend_yield = metrics.get('dividendYieldIndicatedAnnual', 'Unknown')
-        else:
-            pe_ratio = 'Unknown'
-            dividend_yield = 'Unknown'
-            
-        return {
-            'symbol': symbol,
-            'name': company_name,
-            'price': current_price,
-            'ytd': ytd_change,
-            'sector': industry,
-            'industry': industry,
-            'market_cap': market_cap,
-            'pe_ratio': pe_ratio,
-            'dividend_yield': dividend_yield
-        }
+        return _build_stock_record(symbol, current_price, ytd_change, profile, financials)
         
     except Exception as e:
+        # The record is discarded, so don't spend API calls on lookups that have not started yet
+        for future in detail_futures:
+            future.cancel()
         print(f"Error fetching data for {symbol}: {e}")
-        return {
-            'symbol': symbol,
-            'name': symbol,
-            'ytd': 0,
-            'sector': 'Unknown',
-            'industry': 'Unknown',
-            'market_cap': 'Unknown',
-            'pe_ratio': 'Unknown',
-            'dividend_yield': 'Unknown',
-            'price': 0
-        }
+        return _unknown_stock_record(symbol)
+
+def batch_fetch_stock_data(symbols, max_workers=8):
+    """
+    Fetch real-time stock data for many symbols at once
+    
+    Quotes, profiles and financials for all symbols are submitted to one thread
+    pool up front, so every request is in flight as soon as the rate limiter
+    allows. YTD performance is computed for all symbols in a single vectorized
+    NumPy operation.
+    
+    Returns:
+        list: One record per symbol, in the same format as fetch_stock_data
+    """
+    symbols = list(symbols)
+    client = get_finnhub_client()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        quotes = executor.map(client.get_stock_quote, symbols)
+        profiles = executor.map(client.get_company_profile, symbols)
+        financials = executor.map(client.get_basic_financials, symbols)
+        quotes, profiles, financials = list(quotes), list(profiles), list(financials)
+        
+    # Calculate YTD performance (0 when there is no previous close)
+    current = np.array([quote['c'] if quote else 0.0 for quote in quotes], dtype=float)
+    previous = np.array([(quote.get('pc') or 0.0) if quote else 0.0 for quote in quotes], dtype=float)
+    ytd = np.zeros(len(symbols))
+    np.divide(current - previous, previous, out=ytd, where=previous != 0)
+    ytd *= 100
+    
+    records = []
+    for symbol, quote, current_price, ytd_change, profile, financial in zip(
+        symbols, quotes, current.tolist(), ytd.tolist(), profiles, financials
+    ):
+        if not quote:
+            print(f"Error fetching data for {symbol}: Failed to fetch quote data")
+            records.append(_unknown_stock_record(symbol))
+            continue
+        records.append(_build_stock_record(symbol, current_price, ytd_change, profile, financial))
+    return records
 
 def load_nasdaq_data():
     """
@@ -250,60 +649,275 @@ def load_nasdaq_data():
     if not symbols:
         return pd.DataFrame()
         
-    # First, batch fetch/update cached data for all symbols
-    finnhub_client.batch_get_profiles_and_financials(symbols)
-    
-    # Then fetch real-time quotes with caching
-    data = []
-    for symbol in symbols:
-        stock_data = fetch_stock_data(symbol)
-        if stock_data:
-            data.append(stock_data)
+    df = pd.DataFrame(batch_fetch_stock_data(symbols))
+    df['sector'] = config.sector_categorical(df['sector'])
+    return df
+
+def save_stock_data(data_df):
+    """
+    Save fetched stock data to a dated Parquet file in the results directory
+    
+    Returns:
+        str: Path to the saved file, or None if there was nothing to save
+    """
+    if data_df is None or data_df.empty:
+        return None
+        
+    # Parquet needs a single type per column, so 'Unknown' placeholders become NaN
+    numeric_dtypes = {col: dtype for col, dtype in NUMERIC_DTYPES.items() if col in data_df.columns}
+    try:
+        # A single astype converts every numeric column, with no per-column Python loop
+        data_df = data_df.replace({col: 'Unknown' for col in numeric_dtypes}, np.nan).astype(numeric_dtypes)
+    except (TypeError, ValueError):
+        # Some other non-numeric value slipped in; coerce column by column
+        data_df = data_df.copy()
+        for col in numeric_dtypes:
+            data_df[col] = pd.to_numeric(data_df[col], errors='coerce')
             
-    return pd.DataFrame(data)
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    output_path = os.path.join(config.RESULTS_DIR, f"nasdaq100_data_{current_date}_{symbols_digest()}.parquet")
+    # Write to a fresh file so a reader of the "latest" file never sees a partial write
+    output_tmp_path = output_path + ".tmp"
+    data_df.to_parquet(output_tmp_path, engine='pyarrow', compression='zstd', index=False)
+    os.replace(output_tmp_path, output_path)
+    
+    # Point the "latest" file for this symbol list at the new data, atomically
+    # replacing the previous one
+    latest_path = _latest_stock_data_path()
+    latest_tmp_path = latest_path + ".tmp"
+    if os.path.exists(latest_tmp_path):
+        os.remove(latest_tmp_path)
+    try:
+        os.link(output_path, latest_tmp_path)
+    except OSError:
+        shutil.copyfile(output_path, latest_tmp_path)
+    os.replace(latest_tmp_path, latest_path)
+    
+    print(f"Saved stock data to {output_path}")
+    return output_path
 
-# The following functions are kept for backwards compatibility
-def load_mock_data():
+def _latest_stock_data_path():
+    """Path of the most recently saved stock data for the current symbol list"""
+    return os.path.join(config.RESULTS_DIR, f"nasdaq100_data_latest_{symbols_digest()}.parquet")
+
+@functools.lru_cache(maxsize=1)
+def _read_cached_stock_data(path, mtime):
+    """Read saved stock data (cached per on-disk version of the file)"""
+    # Memory-map the file so column buffers are read without an extra copy
+    table = pq.read_table(path, memory_map=True)
+    return table.to_pandas()
+
+def _load_legacy_stock_data():
+    """Load the newest stock data saved as CSV by older versions, or None if there is none"""
+    # Dated names (nasdaq100_data_YYYY-MM-DD.csv) sort chronologically, so the newest is the max
+    latest_file = max(
+        (f for f in os.listdir(config.RESULTS_DIR) if f.startswith("nasdaq100_data_") and f.endswith(".csv")),
+        default=None
+    )
+    if latest_file is None:
+        return None
+        
+    legacy_path = os.path.join(config.RESULTS_DIR, latest_file)
+    print(f"Loading legacy stock data from {legacy_path}")
+    df = pd.read_csv(legacy_path, dtype=NUMERIC_DTYPES, na_values=['Unknown', ''])
+    if 'sector' in df.columns:
+        df['sector'] = config.sector_categorical(df['sector'])
+    return df
+
+def load_cached_stock_data():
     """
-    Load mock data from CSV file instead of fetching real data
+    Load the most recently saved stock data for the current symbol list
+    
+    The file is parsed once and re-read only when a newer save replaces it;
+    each caller receives its own copy. Data saved for a different symbol list
+    (see symbols_digest) is not returned.
+    
+    Returns:
+        pandas.DataFrame: Cached stock data, or None if no data has been saved yet
     """
     try:
-        # Load directly from the mock data CSV file
-        mock_data_path = os.path.join(config.DATA_DIR, "nasdaq100_mock_data.csv")
-        if os.path.exists(mock_data_path):
-            print(f"Loading mock data from {mock_data_path}")
-            df = pd.read_csv(mock_data_path)
-            # Ensure numeric columns are numeric
-            numeric_cols = ['ytd', 'market_cap', 'pe_ratio', 'dividend_yield', 'price']
-            for col in numeric_cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            return df
-        else:
-            print(f"Mock data file not found at {mock_data_path}")
-            return pd.DataFrame()
+        latest_path = _latest_stock_data_path()
+        mtime = _file_mtime(latest_path)
+        if mtime is None:
+            return _load_legacy_stock_data()
+            
+        return _read_cached_stock_data(latest_path, mtime).copy()
+    except Exception as e:
+        print(f"Error loading cached stock data: {e}")
+        return None
+
+def _file_mtime(path):
+    """Return the modification time of a file, or None if it does not exist"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def _read_mock_csv(mock_data_path):
+    """Read the mock data CSV, normalizing numeric and categorical columns"""
+    # Numeric columns are converted by the C parser during tokenization, and the
+    # low-cardinality string columns are far smaller and faster to compare as categories
+    df = pd.read_csv(
+        mock_data_path,
+        dtype={**NUMERIC_DTYPES, 'symbol': 'category', 'industry': 'category'},
+        na_values=['Unknown', '']
+    )
+    if 'sector' in df.columns:
+        df['sector'] = config.sector_categorical(df['sector'])
+    return df
+
+def convert_csv_to_parquet():
+    """
+    Write nasdaq100_mock_data.parquet from nasdaq100_mock_data.csv
+    
+    Returns:
+        str: Path to the Parquet file, or None if the CSV does not exist
+    """
+    if not os.path.exists(MOCK_DATA_CSV):
+        return None
+    
+    _write_mock_parquet(_read_mock_csv(MOCK_DATA_CSV))
+    return MOCK_DATA_PARQUET
+
+def _write_mock_parquet(df):
+    """Write the Parquet copy of the mock data atomically"""
+    # Write to a per-process temporary file, so a concurrent reader never
+    # memory-maps a partially written file
+    tmp_path = f"{MOCK_DATA_PARQUET}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, engine='pyarrow', compression='snappy', index=False)
+    os.replace(tmp_path, MOCK_DATA_PARQUET)
+
+@functools.lru_cache(maxsize=1)
+def _read_mock_data(csv_mtime, parquet_mtime):
+    """
+    Read the mock data from disk (cached per on-disk version of the files)
+    
+    Reads the memory-mapped Parquet copy of the mock data (symbol, sector and
+    industry stored as categoricals), whose column types need no post-processing.
+    When the Parquet file is missing or older than the CSV, the CSV is parsed
+    instead and the Parquet copy is regenerated from it.
+    
+    Read errors are raised rather than cached, so the next call tries again.
+    """
+    if parquet_mtime is not None and (csv_mtime is None or parquet_mtime >= csv_mtime):
+        print(f"Loading mock data from {MOCK_DATA_PARQUET}")
+        return pq.read_table(MOCK_DATA_PARQUET, memory_map=True).to_pandas()
+    
+    if csv_mtime is not None:
+        print(f"Loading mock data from {MOCK_DATA_CSV}")
+        df = _read_mock_csv(MOCK_DATA_CSV)
+        try:
+            _write_mock_parquet(df)
+        except Exception as e:
+            print(f"Could not refresh {MOCK_DATA_PARQUET}: {e}")
+        return df
+    else:
+        print(f"Mock data file not found at {MOCK_DATA_CSV}")
+        return pd.DataFrame()
+
+def _mock_data_mtimes():
+    """Cache key for the mock data: modification times of the CSV and Parquet files"""
+    return (
+        _file_mtime(MOCK_DATA_CSV),
+        _file_mtime(MOCK_DATA_PARQUET),
+    )
+
+def _load_mock_df_cached():
+    """
+    Get the mock DataFrame, re-reading the files only when they change on disk
+    
+    The returned DataFrame is shared between callers and must not be mutated.
+    """
+    try:
+        return _read_mock_data(*_mock_data_mtimes())
+    except Exception as e:
+        print(f"Error loading mock data: {e}")
+        return pd.DataFrame()
+
+@functools.lru_cache(maxsize=1)
+def _index_mock_df(csv_mtime, parquet_mtime):
+    """Index the cached mock DataFrame for this version of the files by symbol"""
+    mock_df = _read_mock_data(csv_mtime, parquet_mtime)
+    if mock_df.empty or 'symbol' not in mock_df.columns:
+        return mock_df
+    return mock_df.set_index('symbol', drop=False)
+
+def _get_mock_df():
+    """
+    Get the mock data indexed by symbol
+    
+    The returned DataFrame is shared between callers and must not be mutated.
+    """
+    try:
+        return _index_mock_df(*_mock_data_mtimes())
     except Exception as e:
         print(f"Error loading mock data: {e}")
         return pd.DataFrame()
 
+# The following functions are kept for backwards compatibility
+def load_mock_data():
+    """
+    Load mock data instead of fetching real data
+    
+    The files are parsed once and re-read only when they change; each caller
+    receives its own copy.
+    """
+    return _load_mock_df_cached().copy()
+
+# Shared generator (NumPy serializes access to it), seeded once rather than per call
+_mock_rng = np.random.default_rng()
+
+def _random_mock_frame(symbols):
+    """Generate random mock data for symbols, drawing each column as one NumPy batch"""
+    n = len(symbols)
+    rng = _mock_rng
+    sectors = rng.choice(config.SECTORS, n)
+    return pd.DataFrame({
+        'symbol': symbols,
+        'name': symbols,
+        'ytd': rng.uniform(-30, 30, n).round(2),
+        'sector': sectors,
+        'industry': sectors,
+        'market_cap': rng.integers(1000000, 2000000000, n),
+        'pe_ratio': rng.uniform(5, 50, n).round(2),
+        'dividend_yield': rng.uniform(0, 5, n).round(2),
+        'price': rng.uniform(10, 1000, n).round(2)
+    })
+
 def generate_mock_data(symbols):
     """
     Return mock data for the given symbols
+    
+    Symbols missing from the mock data file get randomly generated rows.
+    
+    Returns:
+        pandas.DataFrame: Mock stock data with the same columns as load_nasdaq_data
     """
-    mock_df = load_mock_data()
-    if mock_df.empty:
-        return []
+    mock_df = _get_mock_df()
+    frames = []
+    present = set()
+    if not mock_df.empty:
+        # Look the requested symbols up through the hashed symbol index
+        filtered_df = mock_df.loc[mock_df.index.intersection(symbols)]
+        frames.append(filtered_df)
+        present = set(filtered_df.index)
+    
+    missing = [symbol for symbol in symbols if symbol not in present]
+    if missing:
+        frames.append(_random_mock_frame(missing))
+    if not frames:
+        return pd.DataFrame()
     
-    # Filter for the requested symbols
-    filtered_df = mock_df[mock_df['symbol'].isin(symbols)]
-    return filtered_df.to_dict('records')
+    df = pd.concat(frames, ignore_index=True)
+    df['sector'] = config.sector_categorical(df['sector'])
+    return df
 
 # Test the Finnhub integration if this file is run directly
 if __name__ == "__main__":
     print("Testing Finnhub integration...")
     
     # Check API status first
-    api_working, status_msg = finnhub_client.check_api_status()
+    api_working, status_msg = get_finnhub_client().check_api_status()
     print(f"\nAPI Status Check: {status_msg}")
     
     if not api_working:
@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
-import { checkDataStatus, fetchStockData, getTaskStatus, getRecommendations } from '../services/api';
+import { checkDataStatus, fetchStockData, getTaskStatus, getRecommendations, subscribeTaskStatus } from '../services/api';
 
 // --- Types for richer error objects coming back from API layer ---
 interface TaskInfo {
@@ -72,7 +72,7 @@ const AppContext = createContext<AppContextType | undefined>(undefined);
  * - Mock data configuration
  * - Error handling
  * 
- * Provides periodic polling for task status updates and
+ * Streams task status updates from the server and performs
  * automatic data status checking on mount.
  * 
  * @component
@@ -105,35 +105,37 @@ export const AppProvider: React.FC<{ children: React.ReactNode }> = ({ children
     checkData();
   }, []);
 
-  // Poll task status if a task is running
+  // Follow task status updates pushed by the server while a task is running
   useEffect(() => {
-    let interval: number | null = null;
-
-    if (taskRunning) {
-      interval = window.setInterval(async () => {
-        try {
-          const status = await getTaskStatus();
-          setTaskName(status.task);
-          setProgress(status.progress);
-          setTotal(status.total);
-          setMessage(status.message);
-
-          if (status.complete || status.task === null) {
-            setTaskRunning(false);
+    if (!taskRunning) return;
+
+    const unsubscribe = subscribeTaskStatus(
+      async (status) => {
+        setTaskName(status.task);
+        setProgress(status.progress);
+        setTotal(status.total);
+        setMessage(status.message);
+
+        if (status.complete || status.task === null) {
+          unsubscribe();
+          setTaskRunning(false);
+          try {
             // Check if we have data after task completes
             const response = await checkDataStatus();
             setHasData(response.has_data);
+          } catch (err) {
+            console.error('Error checking data status:', err);
           }
-        } catch (err) {
-          console.error('Error checking task status:', err);
-          setTaskRunning(false);
         }
-      }, 1000);
-    }
-
-    return () => {
-      if (interval) window.clearInterval(interval);
-    };
+      },
+      (err) => {
+        console.error('Error streaming task status:', err);
+        unsubscribe();
+        setTaskRunning(false);
+      },
+    );
+
+    return unsubscribe;
   }, [taskRunning]);
 
   const handleFetchData = async () => {
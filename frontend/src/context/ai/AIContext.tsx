@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useState } from 'react';
-import { getRecommendations, getTaskStatus, uploadFiles as apiUploadFiles } from '../../services/api';
+import { getRecommendations, subscribeTaskStatus, uploadFiles as apiUploadFiles } from '../../services/api';
 
 /**
  * Task Information Interface
@@ -136,63 +136,55 @@ export const AIProvider: React.FC<{ children: React.ReactNode }> = ({ children }
     }
   }, []);
 
-  // Function to check task status
-  const checkTaskStatus = React.useCallback(async () => {
+  // Function to follow task status updates pushed by the server
+  const checkTaskStatus = React.useCallback(() => {
     let isActive = true;
     
-    const checkStatus = async () => {
-      try {
+    const unsubscribe = subscribeTaskStatus(
+      async (status) => {
         if (!isActive) return;
         
-        const status = await getTaskStatus();
         console.log('Task status:', status);
+        setTaskInfo(status);
         
-        if (!isActive) return;
+        if (!status.complete) return;
         
-        setTaskInfo(status);
+        unsubscribe();
+        setAiLoading(false);
+        if (status.message.startsWith('Error:')) {
+          setAiError(status.message);
+          return;
+        }
         
-        if (status.complete) {
-          setAiLoading(false);
-          if (status.message.startsWith('Error:')) {
-            setAiError(status.message);
-          } else {
-            try {
-              console.log('Task complete, fetching content...');
-              const content = await fetchRecommendationContent();
-              if (content && isActive) {
-                console.log('Content fetched successfully');
-                setAiAnalysis(content);
-              } else if (isActive) {
-                console.error('Failed to fetch content after all retries');
-                setAiError('Failed to load recommendation content after multiple attempts. Please try again.');
-              }
-            } catch (error: unknown) {
-              if (isActive) {
-                console.error('Error in checkTaskStatus:', error);
-                setAiError(`Error loading recommendation: ${error instanceof Error ? error.message : 'Unknown error'}`);
-              }
-            }
+        try {
+          console.log('Task complete, fetching content...');
+          const content = await fetchRecommendationContent();
+          if (content && isActive) {
+            console.log('Content fetched successfully');
+            setAiAnalysis(content);
+          } else if (isActive) {
+            console.error('Failed to fetch content after all retries');
+            setAiError('Failed to load recommendation content after multiple attempts. Please try again.');
+          }
+        } catch (error: unknown) {
+          if (isActive) {
+            console.error('Error in checkTaskStatus:', error);
+            setAiError(`Error loading recommendation: ${error instanceof Error ? error.message : 'Unknown error'}`);
           }
-        } else if (isActive) {
-          setTimeout(() => {
-            if (isActive) {
-              checkStatus();
-            }
-          }, 2000);
-        }
-      } catch (error: unknown) {
-        if (isActive) {
-          console.error('Error checking task status:', error);
-          setAiError(error instanceof Error ? error.message : 'Unknown error');
-          setAiLoading(false);
         }
-      }
-    };
-    
-    checkStatus();
+      },
+      (event) => {
+        if (!isActive) return;
+        console.error('Error streaming task status:', event);
+        unsubscribe();
+        setAiError('Lost connection to task status stream');
+        setAiLoading(false);
+      },
+    );
     
     return () => {
       isActive = false;
+      unsubscribe();
     };
   }, [fetchRecommendationContent]);
 
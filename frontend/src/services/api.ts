@@ -59,6 +59,26 @@ export const getTaskStatus = async () => {
   return response.data;
 };
 
+export interface TaskStatus {
+  task: string | null;
+  progress: number;
+  total: number;
+  message: string;
+  complete: boolean;
+}
+
+// Subscribe to task status changes pushed by the server (Server-Sent Events).
+// Returns a function that closes the stream.
+export const subscribeTaskStatus = (
+  onStatus: (status: TaskStatus) => void,
+  onError?: (event: Event) => void,
+) => {
+  const source = new EventSource(`${API_URL}/task-events`);
+  source.onmessage = (event: MessageEvent<string>) => onStatus(JSON.parse(event.data));
+  if (onError) source.onerror = onError;
+  return () => source.close();
+};
+
 // Get Recommendations
 export const getRecommendations = async () => {
   try {